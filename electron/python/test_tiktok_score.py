@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Checks for the hook analysis sampling and frame decoding in tiktok_score."""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tiktok_score import HAS_AV, VideoAnalyzer, _HookAccumulator
+
+
+def run_hook(frame_at, fps: float = 30.0):
+    """Feed the frames the hook accumulator asks for and return its score."""
+    hook = _HookAccumulator({'fps': fps}, lambda gray: [])
+    for idx in hook.prepare():
+        hook.consume(idx, frame_at(idx))
+    return hook.finalize()
+
+
+class HookSamplingTest(unittest.TestCase):
+    def test_regular_hard_cuts_earn_scene_change_bonus(self):
+        # Hard cuts every 15 frames between a bright and a dark shot: 5 cuts in
+        # the first 3 seconds, none of which land on a sampled adjacent pair
+        shots = [np.full((64, 36), 245, np.uint8), np.full((64, 36), 10, np.uint8)]
+        score = run_hook(lambda idx: shots[(idx // 15) % 2])
+
+        self.assertEqual(score.scene_changes, 5)
+        self.assertEqual(score.movement, 80)
+        self.assertEqual(score.first_3_seconds, 90)
+
+    def test_hard_cuts_during_camera_motion_are_counted(self):
+        # Two noise-textured shots panning 1 px/frame with a cut every 20
+        # frames: 4 cuts, each a smaller jump than the pan extrapolated across
+        # the gap it falls in
+        rng = np.random.default_rng(0)
+        shots = [
+            rng.integers(180, 226, (64, 200), dtype=np.uint8),
+            rng.integers(125, 171, (64, 200), dtype=np.uint8),
+        ]
+        score = run_hook(lambda idx: shots[(idx // 20) % 2][:, idx:idx + 36])
+
+        self.assertEqual(score.scene_changes, 4)
+        self.assertEqual(score.movement, 80)
+        self.assertEqual(score.first_3_seconds, 90)
+
+    def test_camera_motion_alone_has_no_scene_changes(self):
+        rng = np.random.default_rng(0)
+        shot = rng.integers(125, 171, (64, 200), dtype=np.uint8)
+        score = run_hook(lambda idx: shot[:, idx:idx + 36])
+
+        self.assertEqual(score.scene_changes, 0)
+        self.assertEqual(score.first_3_seconds, 80)
+
+    def test_static_shot_has_no_scene_changes(self):
+        frame = np.full((64, 36), 128, np.uint8)
+        score = run_hook(lambda idx: frame)
+
+        self.assertEqual(score.scene_changes, 0)
+        self.assertEqual(score.first_3_seconds, 40)
+
+
+@unittest.skipUnless(HAS_AV, 'av not installed')
+class VideoRotationTest(unittest.TestCase):
+    def setUp(self):
+        import av
+
+        # A 640x360 landscape recording tagged to display rotated 90 degrees, as
+        # phones store portrait footage; the marker sits top-left when stored
+        fd, self.path = tempfile.mkstemp(suffix='.mp4')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        with av.open(self.path, 'w') as container:
+            stream = container.add_stream('mpeg4', rate=30)
+            stream.width, stream.height, stream.pix_fmt = 640, 360, 'yuv420p'
+            stream.set_display_rotation(90)
+            image = np.zeros((360, 640, 3), np.uint8)
+            image[:60, :120] = 255
+            for _ in range(3):
+                for packet in stream.encode(av.VideoFrame.from_ndarray(image, format='rgb24')):
+                    container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+
+    def test_video_info_reports_upright_size(self):
+        info = VideoAnalyzer()._get_video_info(self.path)
+
+        self.assertEqual(info['resolution'], '360x640')
+        self.assertAlmostEqual(info['aspectRatio'], 0.5625)
+
+    def test_frames_are_decoded_upright(self):
+        (idx, gray), = VideoAnalyzer()._open_frames(self.path, [0])
+
+        self.assertEqual(gray.shape, (640, 360))
+        # Rotated counterclockwise, the stored top-left corner ends up bottom-left
+        self.assertGreater(gray[-5, 5], 200)
+        self.assertLess(gray[5, 5], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,19 +12,33 @@ This server provides:
 Optimized for Apple Silicon with MLX acceleration.
 """
 
+import io
 import os
+import re
+import struct
+import mmap
+import hashlib
+import importlib.util
+import itertools
 import sys
+import atexit
+import signal
 import json
 import uuid
 import logging
 import tempfile
 import platform
+import contextlib
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 
 # Configure logging
@@ -34,14 +48,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger('tts_server')
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if importlib.util.find_spec('hf_transfer') is not None:
+    # Must be set before huggingface_hub is imported; it reads the flag at import time
+    os.environ.setdefault('HF_HUB_ENABLE_HF_TRANSFER', '1')
+else:
+    logger.warning('hf_transfer not installed - model downloads will use a single connection per file')
+
+try:
+    from waitress import serve
+    HAS_WAITRESS = True
+except ImportError:
+    HAS_WAITRESS = False
+    logger.warning('waitress not installed - using the Flask development server')
+
 app = Flask(__name__)
 CORS(app)
 
 # Configuration
 TTS_PORT = int(os.environ.get('TTS_PORT', 8765))
+SERVER_THREADS = 8  # Concurrent requests served by waitress
+VOICES_SAVE_DELAY = 0.5  # Seconds to coalesce voices.json rewrites over
+DOWNLOAD_WORKERS = 8  # Files fetched concurrently by snapshot_download
+STREAM_MIN_CHARS = 40  # Shortest text chunk synthesized on its own when streaming
+IO_WORKERS = 4  # Threads encoding and writing generated audio in the background
 MODELS_DIR = os.environ.get('TTS_MODELS_DIR', os.path.expanduser('~/.crowterminal/models/tts'))
 VOICES_DIR = os.environ.get('TTS_VOICES_DIR', os.path.expanduser('~/.crowterminal/voices'))
 OUTPUT_DIR = os.environ.get('TTS_OUTPUT_DIR', tempfile.gettempdir())
+MPS_DTYPE = os.environ.get('TTS_MPS_DTYPE', 'float16')  # float16, bfloat16 (macOS 14+) or float32
+MLX_QUANT_GROUP_SIZE = 64  # Weights sharing one scale/bias in MLX quantized layers
+MLX_QUANT_PREFIX = 'talker.'  # Only the talker LM is quantized, not the codec or speaker encoder
+QUANTIZATION_BITS = {'q4': 4, 'q8': 8, 'fp16': None}
+MAX_BATCH = int(os.environ.get('TTS_MAX_BATCH', 8))  # Requests coalesced into one model call
+BATCH_WAIT_MS = int(os.environ.get('TTS_BATCH_WAIT_MS', 50))  # How long to wait for a batch to fill
+BATCH_BUCKET_CHARS = 32  # Only batch texts of similar length to limit padding
+
+# Let the CUDA caching allocator grow segments in place instead of fragmenting across requests
+os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'expandable_segments:True')
 
 # Ensure directories exist
 Path(MODELS_DIR).mkdir(parents=True, exist_ok=True)
@@ -61,6 +109,14 @@ SUPPORTED_LANGUAGES = {
     'Spanish': 'Spanish',
     'Italian': 'Italian',
 }
+SUPPORTED_LANGUAGES_SET = frozenset(SUPPORTED_LANGUAGES)
+
+# Short language codes accepted for backwards compatibility
+LANG_MAP = {
+    'en': 'English', 'zh': 'Chinese', 'ja': 'Japanese',
+    'ko': 'Korean', 'de': 'German', 'fr': 'French',
+    'ru': 'Russian', 'pt': 'Portuguese', 'es': 'Spanish', 'it': 'Italian',
+}
 
 # Preset speakers available in CustomVoice models
 PRESET_SPEAKERS = {
@@ -74,6 +130,8 @@ PRESET_SPEAKERS = {
     'Ono_Anna': {'language': 'Japanese', 'description': 'Playful, light Japanese female'},
     'Sohee': {'language': 'Korean', 'description': 'Warm Korean female, rich emotion'},
 }
+PRESET_SPEAKERS_SET = frozenset(PRESET_SPEAKERS)
+DEFAULT_SPEAKER = 'Ryan'
 
 # TTS Model configurations with correct Qwen3-TTS model names
 TTS_MODELS = {
@@ -85,6 +143,9 @@ TTS_MODELS = {
         'ramRequired': 4,
         'repo': 'Qwen/Qwen3-TTS-12Hz-0.6B-Base',
         'type': 'clone',  # Supports voice cloning from audio
+        # MLX weight precision: q4, q8 or fp16. fp16 until quantized output has
+        # been checked against it by ear
+        'quantization': 'fp16',
     },
     'qwen3-tts-0.6b-custom': {
         'name': 'Qwen3-TTS 0.6B (Presets)',
@@ -94,6 +155,7 @@ TTS_MODELS = {
         'ramRequired': 4,
         'repo': 'Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice',
         'type': 'custom',  # Preset speakers with instruct
+        'quantization': 'fp16',
     },
     'qwen3-tts-1.7b-base': {
         'name': 'Qwen3-TTS 1.7B (Clone)',
@@ -103,6 +165,7 @@ TTS_MODELS = {
         'ramRequired': 8,
         'repo': 'Qwen/Qwen3-TTS-12Hz-1.7B-Base',
         'type': 'clone',
+        'quantization': 'fp16',
     },
     'qwen3-tts-1.7b-custom': {
         'name': 'Qwen3-TTS 1.7B (Presets)',
@@ -112,6 +175,7 @@ TTS_MODELS = {
         'ramRequired': 8,
         'repo': 'Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice',
         'type': 'custom',
+        'quantization': 'fp16',
     },
     'qwen3-tts-1.7b-design': {
         'name': 'Qwen3-TTS 1.7B (Design)',
@@ -121,6 +185,7 @@ TTS_MODELS = {
         'ramRequired': 8,
         'repo': 'Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign',
         'type': 'design',  # Voice from text description
+        'quantization': 'fp16',
     },
 }
 
@@ -138,6 +203,86 @@ class VoiceProfile:
     embedding_path: Optional[str] = None
 
 
+def to_pcm16(audio):
+    """Convert a float waveform to int16 samples."""
+    import numpy as np
+
+    # qwen_tts and mlx_audio both hand back host arrays; scale in float32 so
+    # full-scale samples stay within int16
+    return (np.clip(np.asarray(audio, dtype=np.float32), -1, 1) * 32767).astype(np.int16)
+
+
+def write_audio(file, audio, sample_rate: int, output_format: str = 'wav'):
+    """Write int16 samples to a path or file object."""
+    import soundfile as sf
+
+    subtype = 'PCM_16' if output_format == 'wav' else None
+    sf.write(file, audio, sample_rate, format=output_format.upper(), subtype=subtype)
+
+
+def wav_header(sample_rate: int, channels: int = 1) -> bytes:
+    """RIFF header for 16-bit PCM of unknown length, for streamed responses."""
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 0xFFFFFFFF, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+        b'data', 0xFFFFFFFF,
+    )
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text at sentence ends into chunks of at least STREAM_MIN_CHARS."""
+    chunks = []
+    current = ''
+    for sentence in re.findall(r'[^.!?。！？]+[.!?。！？]*\s*|[.!?。！？]+\s*', text):
+        current += sentence
+        if len(current.strip()) >= STREAM_MIN_CHARS:
+            chunks.append(current.strip())
+            current = ''
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks or [text]
+
+
+@dataclass
+class SpeechJob:
+    """A queued model call waiting to be batched."""
+    method: str
+    kwargs: Dict[str, Any]
+    future: Future
+
+
+class MLXTTSModel:
+    """Exposes an mlx-audio model through the Qwen3TTSModel generate_* API."""
+
+    supports_batch = False
+
+    def __init__(self, model):
+        self.model = model
+
+    def _generate(self, **kwargs):
+        import numpy as np
+
+        results = list(self.model.generate(**kwargs))
+        if not results:
+            raise ValueError('MLX model produced no audio')
+        audio = np.concatenate([np.asarray(result.audio, dtype=np.float32) for result in results])
+        return [audio], results[0].sample_rate
+
+    def generate_voice_clone(self, text: str, language: str, ref_audio: str, ref_text: str):
+        from mlx_audio.tts.generate import load_audio
+
+        # mlx-audio takes the reference as samples at the model's rate, not a path
+        audio = load_audio(ref_audio, sample_rate=self.model.sample_rate)
+        return self._generate(text=text, lang_code=language, ref_audio=audio, ref_text=ref_text)
+
+    def generate_custom_voice(self, text: str, language: str, speaker: str, instruct: Optional[str] = None):
+        return self._generate(text=text, lang_code=language, voice=speaker, instruct=instruct)
+
+    def generate_voice_design(self, text: str, language: str, instruct: str):
+        return self._generate(text=text, lang_code=language, instruct=instruct)
+
+
 class TTSService:
     """Service for managing TTS operations."""
 
@@ -146,12 +291,53 @@ class TTSService:
         self.processor = None
         self.current_model_name: Optional[str] = None
         self.current_model_type: Optional[str] = None  # 'clone', 'custom', or 'design'
-        self.device = self._get_device()
+        self.model_memory_bytes: Optional[int] = None  # Resident weight size of the loaded model
+        self.model_dtype: Optional[str] = None  # torch dtype name of the loaded weights, e.g. 'float16'
+        self.current_q_bits = 0  # MLX quantization bits of the loaded model, 0 for fp16
+        self.warmup_ms: Optional[float] = None  # Duration of the post-load warmup generation
+        # Backend each load tries first; self.device is the one the current model runs on
+        self.preferred_device = self._get_device()
+        self.device = self.preferred_device
+        self._torch_configured = False
+        self._configure_torch()
         self.voices: Dict[str, VoiceProfile] = {}
+        # voice_id -> (sample mtime, reference prompt) for the loaded model
+        self._clone_prompts: Dict[str, tuple] = {}
+        # Model type -> generator taking (text, lang, voice_id, speaker, instruct)
+        self._generators = {
+            'clone': self._gen_clone,
+            'custom': self._gen_custom,
+            'design': self._gen_design,
+        }
+        # Guards self.voices and the pending save timer; request threads add and delete voices
+        self._voices_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         self._load_voices()
 
+        # Output names: a per-process nonce plus a counter, instead of a uuid4 per request
+        self._output_nonce = os.urandom(4).hex()
+        self._output_counter = itertools.count(int(time.time()))
+        self._io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='tts-io')
+
+        # A single worker owns the model and coalesces concurrent requests into batches
+        self._jobs: 'queue.Queue[SpeechJob]' = queue.Queue()
+        threading.Thread(target=self._batch_worker, name='tts-batch', daemon=True).start()
+
     def _get_device(self) -> str:
         """Determine the best device for inference."""
+        # Apple Silicon: run natively on MLX when an MLX TTS backend is installed
+        if platform.system() == 'Darwin' and platform.machine() == 'arm64':
+            try:
+                import mlx.core  # noqa: F401
+                import mlx_audio  # noqa: F401
+                return 'mlx'
+            except ImportError:
+                pass
+
+        return self._get_torch_device()
+
+    def _get_torch_device(self) -> str:
+        """Determine the best PyTorch device for inference."""
         try:
             import torch
             if torch.cuda.is_available():
@@ -163,30 +349,83 @@ class TTSService:
 
         return 'cpu'
 
+    def _configure_torch(self):
+        """Turn off autograd and keep CPU-side threads from oversubscribing cores."""
+        if self.device == 'mlx' or self._torch_configured:
+            return
+        try:
+            import torch
+        except ImportError:
+            return
+
+        # Interop threads can only be set once, before any parallel work
+        self._torch_configured = True
+        torch.set_grad_enabled(False)
+        if self.device != 'cpu':
+            # The CPU only handles pre/post-processing here; inference runs on the GPU
+            torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+            torch.set_num_interop_threads(1)
+
+    def _inference_mode(self):
+        """Context for model calls that skips autograd bookkeeping entirely."""
+        if self.device == 'mlx':
+            return contextlib.nullcontext()
+        try:
+            import torch
+        except ImportError:
+            return contextlib.nullcontext()
+        return torch.inference_mode()
+
     def _load_voices(self):
         """Load saved voice profiles from disk."""
         voices_file = Path(VOICES_DIR) / 'voices.json'
         if voices_file.exists():
             try:
-                with open(voices_file, 'r') as f:
-                    data = json.load(f)
-                    for voice_data in data:
-                        voice = VoiceProfile(**voice_data)
-                        self.voices[voice.id] = voice
+                with open(voices_file, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                for voice_data in data:
+                    voice = VoiceProfile(**voice_data)
+                    self.voices[voice.id] = voice
                 logger.info(f'Loaded {len(self.voices)} voice profiles')
             except Exception as e:
                 logger.error(f'Failed to load voices: {e}')
 
     def _save_voices(self):
-        """Save voice profiles to disk."""
+        """Schedule a save of the voice profiles, coalescing bursts of changes."""
+        with self._voices_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(VOICES_SAVE_DELAY, self._write_voices)
+                self._save_timer.start()
+
+    def _write_voices(self):
+        """Atomically write voice profiles to disk."""
+        with self._voices_lock:
+            self._save_timer = None
+            voices = list(self.voices.values())
+
         voices_file = Path(VOICES_DIR) / 'voices.json'
+        tmp_file = voices_file.with_suffix('.json.tmp')
         try:
-            data = [asdict(v) for v in self.voices.values()]
-            with open(voices_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if HAS_ORJSON:
+                raw = orjson.dumps(voices, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS)
+            else:
+                raw = json.dumps([asdict(v) for v in voices], indent=2).encode()
+            with open(tmp_file, 'wb') as f:
+                f.write(raw)
+            # Readers see either the old or the new file, never a partial write
+            os.replace(tmp_file, voices_file)
         except Exception as e:
             logger.error(f'Failed to save voices: {e}')
 
+    def flush_voices(self):
+        """Write a pending debounced save now, e.g. before the process exits."""
+        with self._voices_lock:
+            timer = self._save_timer
+        if timer is not None:
+            timer.cancel()
+            self._write_voices()
+
     def get_status(self) -> Dict[str, Any]:
         """Get service status."""
         return {
@@ -195,6 +434,7 @@ class TTSService:
             'modelLoaded': self.current_model_name is not None,
             'currentModel': self.current_model_name,
             'currentModelType': self.current_model_type,
+            'modelMemoryBytes': self.model_memory_bytes,
             'voiceCount': len(self.voices),
             'supportedLanguages': SUPPORTED_LANGUAGES,
             'presetSpeakers': PRESET_SPEAKERS if self.current_model_type == 'custom' else {},
@@ -235,49 +475,122 @@ class TTSService:
                 repo_id=config['repo'],
                 local_dir=str(model_path),
                 local_dir_use_symlinks=False,
+                max_workers=DOWNLOAD_WORKERS,
             )
 
+            self._verify_download(config['repo'], model_path)
+
             logger.info(f'Model {model_id} downloaded successfully')
             return True
         except Exception as e:
             logger.error(f'Failed to download model: {e}')
             raise
 
-    def load_model(self, model_id: str) -> bool:
-        """Load a TTS model into memory."""
+    def _verify_download(self, repo_id: str, model_path: Path):
+        """Check downloaded weight files against the SHA-256 published on the Hub."""
+        from huggingface_hub import HfApi
+
+        try:
+            siblings = HfApi().model_info(repo_id, files_metadata=True).siblings or []
+        except Exception as e:
+            logger.warning(f'Could not fetch checksums for {repo_id}, skipping verification: {e}')
+            return
+
+        for sibling in siblings:
+            if sibling.lfs is None:
+                continue
+            file_path = model_path / sibling.rfilename
+            if not file_path.exists() or file_path.stat().st_size == 0:
+                continue
+            # Hash through the page cache; the model load right after reads the same pages
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest = hashlib.sha256(mm).hexdigest()
+            if digest != sibling.lfs.sha256:
+                # Remove the model so the next download starts clean instead of reusing a bad file
+                import shutil
+                shutil.rmtree(model_path, ignore_errors=True)
+                raise ValueError(f'Checksum mismatch for {sibling.rfilename}, download removed')
+
+        logger.info(f'Verified checksums for {repo_id}')
+
+    def load_model(self, model_id: str, q_bits: Optional[int] = None) -> bool:
+        """Load a TTS model into memory.
+
+        Args:
+            model_id: Key into TTS_MODELS
+            q_bits: MLX weight quantization bits (4 or 8); defaults to the model's
+                configured quantization, 0 disables it. Ignored off MLX. Asking
+                for the loaded model at other bits reloads it.
+        """
         if model_id not in TTS_MODELS:
             raise ValueError(f'Unknown model: {model_id}')
+        # bool is an int subclass, so reject it explicitly
+        if q_bits is not None and (type(q_bits) is not int or q_bits not in (0, 4, 8)):
+            raise ValueError(f'Unsupported quantization: {q_bits!r} (expected 0, 4 or 8)')
 
         model_path = Path(MODELS_DIR) / model_id
         if not model_path.exists():
             raise ValueError(f'Model not downloaded: {model_id}')
 
-        if self.current_model_name == model_id:
+        if q_bits is None:
+            q_bits = QUANTIZATION_BITS.get(TTS_MODELS[model_id].get('quantization', 'fp16')) or 0
+        if self.current_model_name == model_id and (self.device != 'mlx' or q_bits == self.current_q_bits):
             logger.info(f'Model {model_id} already loaded')
             return True
 
-        # Unload previous model first
+        # Unload previous model first, keeping its cached allocator blocks for the new one
         if self.model is not None:
-            self.unload_model()
+            self.unload_model(release_memory=False)
 
         logger.info(f'Loading model {model_id}...')
 
         try:
+            model_config = TTS_MODELS[model_id]
+
+            self.device = self.preferred_device
+            if self.device == 'mlx':
+                try:
+                    mlx_model = self._read_mlx_checkpoint(model_path)
+                except Exception as e:
+                    # This mlx-audio can't load the checkpoint, but PyTorch can. Only this
+                    # load falls back; the next one tries MLX again.
+                    self.device = self._get_torch_device()
+                    self._configure_torch()
+                    logger.warning(f'mlx-audio could not load {model_id} ({e}), using PyTorch on {self.device} instead')
+                else:
+                    self.model = self._load_mlx_model(mlx_model, q_bits)
+                    self.current_model_name = model_id
+                    self.current_q_bits = q_bits
+                    self.current_model_type = model_config.get('type', 'clone')
+                    logger.info(f'Model {model_id} (type: {self.current_model_type}) loaded on mlx')
+                    try:
+                        self._warmup()
+                    except Exception as e:
+                        # The checkpoint loaded but mlx-audio can't generate with it, so
+                        # every request would fail; load it on PyTorch instead
+                        del mlx_model
+                        self.unload_model(release_memory=False)
+                        self.device = self._get_torch_device()
+                        self._configure_torch()
+                        logger.warning(f'mlx-audio could not generate with {model_id} ({e}), using PyTorch on {self.device} instead')
+                    else:
+                        return True
+
             import torch
-            from qwen_tts import Qwen3TTSModel
+            from qwen_tts import Qwen3TTSModel, VoiceClonePromptItem
 
-            model_config = TTS_MODELS[model_id]
+            # Lets cached clone prompts load with weights_only=True
+            torch.serialization.add_safe_globals([VoiceClonePromptItem])
 
             # Determine dtype based on device
-            # Note: MPS works best with float32 for stability
             if self.device == 'cuda':
                 dtype = torch.bfloat16
                 device_map = 'cuda:0'
                 attn_impl = 'flash_attention_2'
             elif self.device == 'mps':
-                # Use float32 on MPS for numerical stability
-                dtype = torch.float32
-                device_map = 'auto'  # Let the library decide
+                # Decode is memory-bandwidth bound, so half precision roughly doubles throughput
+                dtype = self._get_mps_dtype(torch)
+                device_map = 'mps'  # Stream shards straight to the device instead of planning with accelerate
                 attn_impl = None  # MPS doesn't support flash attention
             else:
                 dtype = torch.float32
@@ -292,11 +605,16 @@ class TTSService:
                 device_map=device_map,
                 torch_dtype=dtype,
                 attn_implementation=attn_impl,
+                # Materialize weights shard by shard from the mmap'd safetensors instead of
+                # building a randomly initialized model first and copying over it
+                low_cpu_mem_usage=True,
             )
 
             self.current_model_name = model_id
             self.current_model_type = model_config.get('type', 'clone')
+            self.model_dtype = str(dtype).replace('torch.', '')
             logger.info(f'Model {model_id} (type: {self.current_model_type}) loaded on {self.device}')
+            self._warmup()
             return True
         except ImportError as e:
             logger.error(f'qwen_tts not installed. Please run: pip install qwen-tts')
@@ -305,8 +623,111 @@ class TTSService:
             logger.error(f'Failed to load model: {e}')
             raise
 
-    def unload_model(self):
-        """Unload the current model to free memory."""
+    def _warmup(self):
+        """Run a short generation so the first request doesn't pay for kernel setup.
+
+        On MLX a failed generation is raised so load_model can fall back to
+        PyTorch; elsewhere it is only logged.
+        """
+        self.warmup_ms = None
+        start = time.perf_counter()
+        try:
+            if self.current_model_type == 'custom':
+                self._run_model('generate_custom_voice', text='Hello.', language='English', speaker=DEFAULT_SPEAKER)
+            elif self.current_model_type == 'design':
+                self._run_model(
+                    'generate_voice_design',
+                    text='Hello.',
+                    language='English',
+                    instruct='A calm, neutral voice.',
+                )
+            else:
+                # Clone models need a reference; warming with a saved voice also caches its prompt
+                with self._voices_lock:
+                    voices = list(self.voices.values())
+                voice = next(
+                    (v for v in voices if v.transcript and Path(v.sample_path).exists()),
+                    None,
+                )
+                if voice is None:
+                    logger.info('No saved voice to warm up the clone model with')
+                    return
+                self._generate_voice_clone('Hello.', 'English', voice)
+        except Exception as e:
+            if self.device == 'mlx':
+                raise
+            logger.warning(f'Model warmup failed: {e}')
+            return
+
+        self.warmup_ms = (time.perf_counter() - start) * 1000
+        logger.info(f'Model warmed up in {self.warmup_ms:.0f}ms')
+
+    def _get_mps_dtype(self, torch):
+        """Resolve TTS_MPS_DTYPE to a torch dtype, falling back to float16."""
+        if MPS_DTYPE == 'float32':
+            return torch.float32
+        if MPS_DTYPE == 'bfloat16':
+            # MPS bfloat16 kernels need macOS 14 or later
+            mac_version = platform.mac_ver()[0]
+            if mac_version and int(mac_version.split('.')[0]) >= 14:
+                return torch.bfloat16
+            logger.warning(f'bfloat16 on MPS requires macOS 14+ (found {mac_version or "unknown"}), using float16')
+        elif MPS_DTYPE != 'float16':
+            logger.warning(f'Unknown TTS_MPS_DTYPE "{MPS_DTYPE}", using float16')
+        return torch.float16
+
+    def _read_mlx_checkpoint(self, model_path: Path):
+        """Build the mlx-audio model for a downloaded checkpoint."""
+        from mlx_audio.tts.utils import load_model as load_mlx_model
+
+        return load_mlx_model(str(model_path))
+
+    def _load_mlx_model(self, model, q_bits: Optional[int] = None) -> 'MLXTTSModel':
+        """Quantize an mlx-audio model and materialize its weights."""
+        import mlx.core as mx
+        import mlx.nn as nn
+        from mlx.utils import tree_flatten
+
+        already_quantized = any(isinstance(m, nn.QuantizedLinear) for _, m in model.named_modules())
+        if q_bits and not already_quantized:
+            if q_bits not in (4, 8):
+                raise ValueError(f'Unsupported quantization: {q_bits} bits')
+            # Only the talker's transformer Linear layers, and only where the input
+            # dimension splits evenly into groups. Embeddings, output heads, the
+            # speech tokenizer's codec decoder and the speaker encoder keep fp16.
+            quantized = []
+
+            def predicate(path: str, m) -> bool:
+                if (
+                    isinstance(m, nn.Linear)
+                    and path.startswith(MLX_QUANT_PREFIX)
+                    and '.layers.' in path
+                    and m.weight.shape[-1] % MLX_QUANT_GROUP_SIZE == 0
+                ):
+                    quantized.append(path)
+                    return True
+                return False
+
+            nn.quantize(model, group_size=MLX_QUANT_GROUP_SIZE, bits=q_bits, class_predicate=predicate)
+            if quantized:
+                logger.info(
+                    f'Quantized {len(quantized)} talker layers to {q_bits} bits (group size {MLX_QUANT_GROUP_SIZE})'
+                )
+            else:
+                logger.warning(f'No {MLX_QUANT_PREFIX}* layers to quantize, weights stay fp16')
+
+        # MLX is lazy: force the weights into memory now rather than on the first request
+        mx.eval(model.parameters())
+        self.model_memory_bytes = sum(v.nbytes for _, v in tree_flatten(model.parameters()))
+        return MLXTTSModel(model)
+
+    def unload_model(self, release_memory: bool = True):
+        """Unload the current model to free memory.
+
+        Args:
+            release_memory: Return cached device memory to the system. Skipped when
+                another model is about to be loaded into the same allocator pool.
+        """
         if self.model is not None:
             del self.model
             if self.processor is not None:
@@ -315,19 +736,33 @@ class TTSService:
             self.processor = None
             self.current_model_name = None
             self.current_model_type = None
+            self.model_memory_bytes = None
+            self.model_dtype = None
+            self.current_q_bits = 0
+            self.warmup_ms = None
+            self._clone_prompts.clear()
 
             # Force garbage collection
             import gc
             gc.collect()
 
-            try:
-                import torch
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                if hasattr(torch, 'mps') and hasattr(torch.mps, 'empty_cache'):
-                    torch.mps.empty_cache()
-            except Exception:
-                pass
+            if release_memory and self.device == 'mlx':
+                try:
+                    import mlx.core as mx
+                    # mx.clear_cache replaced mx.metal.clear_cache in newer MLX releases
+                    clear_cache = getattr(mx, 'clear_cache', None) or mx.metal.clear_cache
+                    clear_cache()
+                except Exception:
+                    pass
+            elif release_memory:
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
+                    if hasattr(torch, 'mps') and hasattr(torch.mps, 'empty_cache'):
+                        torch.mps.empty_cache()
+                except Exception:
+                    pass
 
             logger.info('Model unloaded')
 
@@ -337,9 +772,14 @@ class TTSService:
         name: str,
         description: str = '',
         language: str = 'en',
-        transcript: str = ''
+        transcript: str = '',
+        move: bool = False
     ) -> VoiceProfile:
-        """Clone a voice from an audio sample."""
+        """Clone a voice from an audio sample.
+
+        When move is set the sample is renamed into VOICES_DIR instead of copied,
+        which is what uploads saved to a temp file want.
+        """
         if not Path(audio_path).exists():
             raise ValueError(f'Audio file not found: {audio_path}')
 
@@ -351,7 +791,10 @@ class TTSService:
         sample_path = Path(VOICES_DIR) / f'{voice_id}_sample{sample_ext}'
 
         import shutil
-        shutil.copy2(audio_path, sample_path)
+        if move:
+            shutil.move(audio_path, sample_path)
+        else:
+            shutil.copy2(audio_path, sample_path)
 
         # Create voice profile
         voice = VoiceProfile(
@@ -364,30 +807,213 @@ class TTSService:
             transcript=transcript,
         )
 
-        # Extract voice embedding if model is loaded
-        if self.model is not None:
-            embedding_path = Path(VOICES_DIR) / f'{voice_id}_embedding.npy'
-            # Note: Actual embedding extraction would happen here
-            # For now, we store the sample path for reference cloning
-            voice.embedding_path = str(embedding_path)
-
-        self.voices[voice_id] = voice
+        with self._voices_lock:
+            self.voices[voice_id] = voice
         self._save_voices()
 
+        # Encode the reference now so the first generation doesn't pay for it
+        if self.model is not None and self.current_model_type == 'clone' and transcript:
+            try:
+                self._get_clone_prompt(voice)
+            except Exception as e:
+                logger.warning(f'Failed to pre-encode voice {voice_id}: {e}')
+
         logger.info(f'Voice "{name}" cloned successfully with ID: {voice_id}')
         return voice
 
-    def generate_speech(
+    def _get_clone_prompt(self, voice: VoiceProfile):
+        """Get the encoded reference prompt for a voice, encoding it on first use."""
+        if not hasattr(self.model, 'create_voice_clone_prompt'):
+            return None
+
+        mtime = os.path.getmtime(voice.sample_path)
+        cached = self._clone_prompts.get(voice.id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        # Prompt tensors keep the model's device and dtype, so the disk cache is per
+        # model, device and dtype
+        import torch
+        cache_path = os.path.join(
+            VOICES_DIR,
+            f'{voice.id}_{self.current_model_name}_{self.device}_{self.model_dtype}_prompt.pt',
+        )
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= mtime:
+            try:
+                prompt = torch.load(cache_path, weights_only=True)
+                self._clone_prompts[voice.id] = (mtime, prompt)
+                return prompt
+            except Exception as e:
+                logger.warning(f'Ignoring unreadable prompt cache {cache_path}: {e}')
+
+        # Encoding runs the model too, so it goes through the worker like generation
+        prompt = self._run_model(
+            'create_voice_clone_prompt',
+            ref_audio=voice.sample_path,
+            ref_text=voice.transcript,
+        )
+        self._clone_prompts[voice.id] = (mtime, prompt)
+        logger.info(f'Encoded reference audio for voice {voice.id}')
+
+        try:
+            torch.save(prompt, cache_path)
+        except Exception as e:
+            logger.warning(f'Failed to cache prompt for voice {voice.id}: {e}')
+        return prompt
+
+    def _run_model(self, method: str, **kwargs):
+        """Queue a model call for the batch worker and wait for its result."""
+        future: Future = Future()
+        self._jobs.put(SpeechJob(method, kwargs, future))
+        return future.result()
+
+    def _batch_worker(self):
+        """Drain queued jobs into batches of similar-length texts and run them.
+
+        A lone job runs at once. The batch window is only waited out when other
+        jobs are already queued, i.e. requests are arriving concurrently.
+        """
+        while True:
+            jobs = [self._jobs.get()]
+            if 'text' in jobs[0].kwargs:
+                while len(jobs) < MAX_BATCH:
+                    try:
+                        jobs.append(self._jobs.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if len(jobs) > 1 and getattr(self.model, 'supports_batch', True):
+                    deadline = time.monotonic() + BATCH_WAIT_MS / 1000
+                    while len(jobs) < MAX_BATCH:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            jobs.append(self._jobs.get(timeout=remaining))
+                        except queue.Empty:
+                            break
+
+            groups: Dict[tuple, List[SpeechJob]] = {}
+            for job in jobs:
+                if 'text' in job.kwargs:
+                    key = (job.method, tuple(sorted(job.kwargs)), len(job.kwargs['text']) // BATCH_BUCKET_CHARS)
+                else:
+                    # Not a generate_* call (e.g. prompt encoding): run it on its own
+                    key = (id(job),)
+                groups.setdefault(key, []).append(job)
+
+            # Grad mode is per thread, so the worker sets up its own inference context
+            with self._inference_mode():
+                for group in groups.values():
+                    self._run_batch(group)
+
+    def _run_batch(self, jobs: List[SpeechJob]):
+        """Run jobs sharing a method in one model call, one at a time if that fails."""
+        if self.model is None:
+            for job in jobs:
+                job.future.set_exception(ValueError('No model loaded. Please load a model first.'))
+            return
+
+        if len(jobs) == 1 or not getattr(self.model, 'supports_batch', True):
+            for job in jobs:
+                try:
+                    job.future.set_result(getattr(self.model, job.method)(**job.kwargs))
+                except Exception as e:
+                    job.future.set_exception(e)
+            return
+
+        # The qwen_tts generate_* methods accept lists and pad the batch internally
+        batch_kwargs = {}
+        for key in jobs[0].kwargs:
+            values = [job.kwargs[key] for job in jobs]
+            if key == 'voice_clone_prompt':
+                values = [item for value in values for item in value]
+            batch_kwargs[key] = values
+
+        try:
+            wavs, sample_rate = getattr(self.model, jobs[0].method)(**batch_kwargs)
+        except Exception as e:
+            logger.warning(f'Batched {jobs[0].method} of {len(jobs)} failed, running individually: {e}')
+            for job in jobs:
+                self._run_batch([job])
+            return
+
+        if len(wavs) != len(jobs):
+            logger.warning(f'Batched {jobs[0].method} returned {len(wavs)} of {len(jobs)} outputs, running individually')
+            for job in jobs:
+                self._run_batch([job])
+            return
+
+        logger.info(f'Generated a batch of {len(jobs)} requests')
+        for job, wav in zip(jobs, wavs):
+            job.future.set_result(([wav], sample_rate))
+
+    def _generate_voice_clone(self, text: str, lang: str, voice: VoiceProfile):
+        """Clone a voice, reusing its cached reference prompt when the model supports it."""
+        prompt = self._get_clone_prompt(voice)
+        if prompt is not None:
+            return self._run_model(
+                'generate_voice_clone',
+                text=text,
+                language=lang,
+                voice_clone_prompt=prompt,
+            )
+        return self._run_model(
+            'generate_voice_clone',
+            text=text,
+            language=lang,
+            ref_audio=voice.sample_path,
+            ref_text=voice.transcript,
+        )
+
+    def _gen_clone(self, text: str, lang: str, voice_id: Optional[str], speaker: str, instruct: str):
+        """Voice cloning with reference audio."""
+        if not voice_id:
+            raise ValueError('No voice specified. Model type "clone" requires a cloned voice')
+        voice = self.voices.get(voice_id)
+        if voice is None:
+            raise ValueError(f'Voice not found: {voice_id}')
+
+        # Validate voice has required data
+        if not voice.sample_path or not Path(voice.sample_path).exists():
+            raise ValueError(f'Voice sample audio file not found: {voice.sample_path}')
+        if not voice.transcript or len(voice.transcript.strip()) < 3:
+            raise ValueError(f'Voice transcript is missing or too short. Please provide the exact text spoken in the audio sample.')
+
+        logger.info(f'Cloning voice: ref_audio={voice.sample_path}, ref_text="{voice.transcript[:50]}..."')
+        return self._generate_voice_clone(text, lang, voice)
+
+    def _gen_custom(self, text: str, lang: str, voice_id: Optional[str], speaker: str, instruct: str):
+        """Preset speaker with optional emotion."""
+        return self._run_model(
+            'generate_custom_voice',
+            text=text,
+            language=lang,
+            speaker=speaker if speaker in PRESET_SPEAKERS_SET else DEFAULT_SPEAKER,
+            instruct=instruct or None,
+        )
+
+    def _gen_design(self, text: str, lang: str, voice_id: Optional[str], speaker: str, instruct: str):
+        """Voice design from a text description."""
+        if not instruct:
+            raise ValueError('No voice specified. Model type "design" requires an instruct description')
+        return self._run_model(
+            'generate_voice_design',
+            text=text,
+            language=lang,
+            instruct=instruct,
+        )
+
+    def synthesize(
         self,
         text: str,
         voice_id: Optional[str] = None,
         language: str = 'English',
         speed: float = 1.0,
         instruct: str = '',
-        speaker: str = '',
-        output_format: str = 'wav'
-    ) -> str:
-        """Generate speech from text.
+        speaker: str = ''
+    ) -> Tuple[Any, int]:
+        """Generate speech from text as int16 samples and their sample rate.
 
         Args:
             text: The text to synthesize
@@ -396,110 +1022,90 @@ class TTSService:
             speed: Speech speed multiplier
             instruct: Emotion/style instruction (e.g., 'happy', 'sad', 'whispering')
             speaker: Preset speaker name (for CustomVoice models)
-            output_format: Output audio format ('wav' or 'mp3')
         """
         if self.model is None:
             raise ValueError('No model loaded. Please load a model first.')
 
         # Normalize language name
-        if language in SUPPORTED_LANGUAGES:
-            lang = language
-        else:
-            # Try to map short codes to full names for backwards compatibility
-            lang_map = {'en': 'English', 'zh': 'Chinese', 'ja': 'Japanese',
-                       'ko': 'Korean', 'de': 'German', 'fr': 'French',
-                       'ru': 'Russian', 'pt': 'Portuguese', 'es': 'Spanish', 'it': 'Italian'}
-            lang = lang_map.get(language, 'English')
-
-        # Generate unique output filename
-        output_filename = f'tts_{uuid.uuid4().hex[:8]}.{output_format}'
-        output_path = Path(OUTPUT_DIR) / output_filename
+        lang = language if language in SUPPORTED_LANGUAGES_SET else LANG_MAP.get(language, 'English')
 
         logger.info(f'Generating speech: "{text[:50]}..." type={self.current_model_type}, voice={voice_id}, speaker={speaker}, lang={lang}')
 
         try:
-            import soundfile as sf
+            generator = self._generators.get(self.current_model_type)
+            if generator is None:
+                raise ValueError(f'Unsupported model type: {self.current_model_type}')
+            wavs, sample_rate = generator(text, lang, voice_id, speaker, instruct)
 
-            # Generate based on model type
-            if self.current_model_type == 'clone' and voice_id:
-                # Voice cloning with reference audio
-                if voice_id not in self.voices:
-                    raise ValueError(f'Voice not found: {voice_id}')
+            audio_data = wavs[0] if isinstance(wavs, (list, tuple)) else wavs
+            return to_pcm16(audio_data), sample_rate
+        except Exception as e:
+            import traceback
+            logger.error(f'Failed to generate speech: {e}')
+            logger.error(f'Traceback: {traceback.format_exc()}')
+            raise
 
-                voice = self.voices[voice_id]
+    def synthesize_stream(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        language: str = 'English',
+        speed: float = 1.0,
+        instruct: str = '',
+        speaker: str = ''
+    ) -> Iterator[Tuple[Any, int]]:
+        """Generate speech sentence by sentence, yielding int16 chunks as each is ready."""
+        for chunk in split_sentences(text):
+            yield self.synthesize(chunk, voice_id, language, speed, instruct, speaker)
 
-                # Validate voice has required data
-                if not voice.sample_path or not Path(voice.sample_path).exists():
-                    raise ValueError(f'Voice sample audio file not found: {voice.sample_path}')
-                if not voice.transcript or len(voice.transcript.strip()) < 3:
-                    raise ValueError(f'Voice transcript is missing or too short. Please provide the exact text spoken in the audio sample.')
+    def generate_speech(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        language: str = 'English',
+        speed: float = 1.0,
+        instruct: str = '',
+        speaker: str = '',
+        output_format: str = 'wav',
+        background: bool = False
+    ) -> str:
+        """Generate speech from text and write it to OUTPUT_DIR.
 
-                logger.info(f'Cloning voice: ref_audio={voice.sample_path}, ref_text="{voice.transcript[:50]}..."')
+        Takes the same arguments as synthesize, plus output_format ('wav' or 'mp3').
+        With background set, the file is written on the I/O pool and the path is
+        returned before it exists. Returns the path of the output file.
+        """
+        audio, sample_rate = self.synthesize(text, voice_id, language, speed, instruct, speaker)
 
-                wavs, sample_rate = self.model.generate_voice_clone(
-                    text=text,
-                    language=lang,
-                    ref_audio=voice.sample_path,
-                    ref_text=voice.transcript,
-                )
-            elif self.current_model_type == 'custom':
-                # Preset speaker with optional emotion
-                preset_speaker = speaker if speaker and speaker in PRESET_SPEAKERS else 'Ryan'
-                wavs, sample_rate = self.model.generate_custom_voice(
-                    text=text,
-                    language=lang,
-                    speaker=preset_speaker,
-                    instruct=instruct if instruct else None,
-                )
-            elif self.current_model_type == 'design' and instruct:
-                # Voice design from description
-                wavs, sample_rate = self.model.generate_voice_design(
-                    text=text,
-                    language=lang,
-                    instruct=instruct,
-                )
-            else:
-                # Default: use custom voice with default speaker or clone if available
-                if self.current_model_type == 'custom':
-                    wavs, sample_rate = self.model.generate_custom_voice(
-                        text=text,
-                        language=lang,
-                        speaker=speaker if speaker else 'Ryan',
-                    )
-                elif voice_id and voice_id in self.voices:
-                    voice = self.voices[voice_id]
-                    wavs, sample_rate = self.model.generate_voice_clone(
-                        text=text,
-                        language=lang,
-                        ref_audio=voice.sample_path,
-                        ref_text=voice.transcript,
-                    )
-                else:
-                    raise ValueError(
-                        f'No voice specified. Model type "{self.current_model_type}" requires '
-                        f'{"a cloned voice" if self.current_model_type == "clone" else "a preset speaker or instruct"}'
-                    )
+        # Generate unique output filename
+        output_filename = f'tts_{self._output_nonce}_{next(self._output_counter):x}.{output_format}'
+        output_path = os.path.join(OUTPUT_DIR, output_filename)
 
-            # Write audio to file
-            audio_data = wavs[0] if isinstance(wavs, (list, tuple)) else wavs
+        if background:
+            future = self._io_pool.submit(self._write_output, output_path, audio, sample_rate, output_format)
+            future.add_done_callback(self._on_write_done)
+        else:
+            self._write_output(output_path, audio, sample_rate, output_format)
 
-            # Convert to numpy if it's a tensor
-            if hasattr(audio_data, 'cpu'):
-                audio_data = audio_data.cpu().numpy()
+        return output_path
 
-            sf.write(str(output_path), audio_data, sample_rate)
+    def _write_output(self, output_path: str, audio, sample_rate: int, output_format: str):
+        """Write audio next to its final path and rename it into place once complete."""
+        partial_path = output_path + '.part'
+        write_audio(partial_path, audio, sample_rate, output_format)
+        os.replace(partial_path, output_path)
+        logger.info(f'Speech generated: {output_path} (sample_rate={sample_rate})')
 
-            logger.info(f'Speech generated: {output_path} (sample_rate={sample_rate})')
-            return str(output_path)
-        except Exception as e:
-            import traceback
-            logger.error(f'Failed to generate speech: {e}')
-            logger.error(f'Traceback: {traceback.format_exc()}')
-            raise
+    def _on_write_done(self, future: Future):
+        """Log failures of background writes, which have no request left to report to."""
+        if future.exception() is not None:
+            logger.error(f'Failed to write speech: {future.exception()}')
 
     def list_voices(self) -> List[Dict[str, Any]]:
         """List all saved voice profiles."""
-        return [asdict(v) for v in self.voices.values()]
+        with self._voices_lock:
+            voices = list(self.voices.values())
+        return [asdict(v) for v in voices]
 
     def delete_voice(self, voice_id: str) -> bool:
         """Delete a voice profile."""
@@ -514,10 +1120,14 @@ class TTSService:
                 Path(voice.sample_path).unlink()
             if voice.embedding_path and Path(voice.embedding_path).exists():
                 Path(voice.embedding_path).unlink()
+            for cache_path in Path(VOICES_DIR).glob(f'{voice_id}_*_prompt.pt'):
+                cache_path.unlink()
         except Exception as e:
             logger.error(f'Failed to delete voice files: {e}')
 
-        del self.voices[voice_id]
+        with self._voices_lock:
+            self.voices.pop(voice_id, None)
+        self._clone_prompts.pop(voice_id, None)
         self._save_voices()
 
         logger.info(f'Voice {voice_id} deleted')
@@ -580,9 +1190,10 @@ def download_model(model_id: str):
 @app.route('/models/<model_id>/load', methods=['POST'])
 def load_model(model_id: str):
     """Load a TTS model."""
+    data = request.get_json(silent=True) or {}
     try:
-        tts_service.load_model(model_id)
-        return jsonify({'success': True, 'modelId': model_id})
+        tts_service.load_model(model_id, q_bits=data.get('qBits'))
+        return jsonify({'success': True, 'modelId': model_id, 'warmupMs': tts_service.warmup_ms})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -610,6 +1221,8 @@ def list_voices():
 @app.route('/voices/clone', methods=['POST'])
 def clone_voice():
     """Clone a voice from an audio sample."""
+    uploaded = False
+
     # Support both JSON and form data
     if request.is_json:
         data = request.get_json()
@@ -628,18 +1241,24 @@ def clone_voice():
         # Handle file upload if present
         if 'audio' in request.files:
             audio_file = request.files['audio']
-            temp_path = Path(tempfile.gettempdir()) / f'voice_sample_{uuid.uuid4().hex[:8]}{Path(audio_file.filename).suffix}'
+            # Save next to the voices so clone_voice can rename it into place instead of copying
+            temp_path = Path(VOICES_DIR) / f'upload_{uuid.uuid4().hex[:8]}{Path(audio_file.filename).suffix}'
             audio_file.save(str(temp_path))
             audio_path = str(temp_path)
+            uploaded = True
 
     if not audio_path:
         return jsonify({'success': False, 'error': 'No audio provided'}), 400
 
     try:
-        voice = tts_service.clone_voice(audio_path, name, description, language, transcript)
+        voice = tts_service.clone_voice(audio_path, name, description, language, transcript, move=uploaded)
         return jsonify({'success': True, 'voice': asdict(voice)})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
+    finally:
+        # A successful clone has already moved the upload into place
+        if uploaded:
+            Path(audio_path).unlink(missing_ok=True)
 
 
 @app.route('/voices/<voice_id>', methods=['DELETE'])
@@ -661,12 +1280,16 @@ def generate():
         language (str): Language name (default: 'English')
         speed (float): Speech speed (default: 1.0)
         format (str): Output format 'wav' or 'mp3' (default: 'wav')
+        async (bool): Return as soon as audio is generated; the file appears at
+            outputPath once written (default: False)
     """
     data = request.get_json()
 
     if not data or 'text' not in data:
         return jsonify({'success': False, 'error': 'No text provided'}), 400
 
+    background = bool(data.get('async', False))
+
     try:
         output_path = tts_service.generate_speech(
             text=data['text'],
@@ -676,10 +1299,12 @@ def generate():
             language=data.get('language', 'English'),
             speed=data.get('speed', 1.0),
             output_format=data.get('format', 'wav'),
+            background=background,
         )
         return jsonify({
             'success': True,
             'outputPath': output_path,
+            'pending': background,
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -693,21 +1318,55 @@ def generate_stream():
     if not data or 'text' not in data:
         return jsonify({'success': False, 'error': 'No text provided'}), 400
 
+    output_format = data.get('format', 'wav')
+
     try:
-        output_path = tts_service.generate_speech(
+        if output_format == 'wav':
+            chunks = tts_service.synthesize_stream(
+                text=data['text'],
+                voice_id=data.get('voiceId'),
+                speaker=data.get('speaker', ''),
+                instruct=data.get('instruct', ''),
+                language=data.get('language', 'English'),
+                speed=data.get('speed', 1.0),
+            )
+            # Synthesize the first sentence up front so bad requests still get a JSON error
+            first_audio, sample_rate = next(chunks)
+
+            def stream():
+                yield wav_header(sample_rate)
+                yield first_audio.tobytes()
+                try:
+                    for audio, _ in chunks:
+                        yield audio.tobytes()
+                except Exception as e:
+                    logger.error(f'Streaming generation stopped: {e}')
+
+            return Response(
+                stream(),
+                mimetype='audio/wav',
+                headers={'Content-Disposition': 'attachment; filename=generated_speech.wav'},
+            )
+
+        audio, sample_rate = tts_service.synthesize(
             text=data['text'],
             voice_id=data.get('voiceId'),
             speaker=data.get('speaker', ''),
             instruct=data.get('instruct', ''),
             language=data.get('language', 'English'),
             speed=data.get('speed', 1.0),
-            output_format=data.get('format', 'wav'),
         )
+
+        # Encode in memory; the response never touches the disk
+        buffer = io.BytesIO()
+        write_audio(buffer, audio, sample_rate, output_format)
+        buffer.seek(0)
+
         return send_file(
-            output_path,
-            mimetype='audio/wav',
+            buffer,
+            mimetype='audio/mpeg' if output_format == 'mp3' else 'audio/wav',
             as_attachment=True,
-            download_name=f'generated_speech.{data.get("format", "wav")}'
+            download_name=f'generated_speech.{output_format}'
         )
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -734,4 +1393,13 @@ if __name__ == '__main__':
     logger.info(f'Voices directory: {VOICES_DIR}')
     logger.info(f'Device: {tts_service.device}')
 
-    app.run(host='127.0.0.1', port=TTS_PORT, debug=False)
+    # Electron stops the server with SIGTERM: exit normally so a pending voices save is written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    atexit.register(tts_service.flush_voices)
+
+    if HAS_WAITRESS:
+        # Electron waits for waitress' "Serving on" line, which is logged at INFO
+        logging.getLogger('waitress').setLevel(logging.INFO)
+        serve(app, host='127.0.0.1', port=TTS_PORT, threads=SERVER_THREADS)
+    else:
+        app.run(host='127.0.0.1', port=TTS_PORT, debug=False, threaded=True)
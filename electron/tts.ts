@@ -272,8 +272,8 @@ export class TTSService {
         stdout += output;
         log.info('TTS server stdout:', output);
 
-        // Check for server ready message
-        if (output.includes('Running on')) {
+        // Flask dev server prints "Running on", waitress prints "Serving on"
+        if (output.includes('Running on') || output.includes('Serving on')) {
           this.isServerReady = true;
           log.info('TTS server started successfully');
           resolve(true);
@@ -285,8 +285,8 @@ export class TTSService {
         stderr += output;
         log.info('TTS server stderr:', output);
 
-        // Flask also logs to stderr
-        if (output.includes('Running on')) {
+        // Flask and waitress also log to stderr
+        if (output.includes('Running on') || output.includes('Serving on')) {
           this.isServerReady = true;
           log.info('TTS server started successfully');
           resolve(true);
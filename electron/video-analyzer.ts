@@ -220,7 +220,8 @@ export class VideoAnalyzerService {
         const output = data.toString();
         log.debug('Video Analyzer stdout:', output);
 
-        if (output.includes('Running on')) {
+        // Flask dev server prints "Running on", waitress prints "Serving on"
+        if (output.includes('Running on') || output.includes('Serving on')) {
           this.isServerReady = true;
           log.info('Video Analyzer server started successfully');
           resolve(true);
@@ -231,7 +232,7 @@ export class VideoAnalyzerService {
         stderr += data.toString();
         log.debug('Video Analyzer stderr:', data.toString());
 
-        if (data.toString().includes('Running on')) {
+        if (data.toString().includes('Running on') || data.toString().includes('Serving on')) {
           this.isServerReady = true;
           log.info('Video Analyzer server started successfully');
           resolve(true);